@@ -0,0 +1,62 @@
+"""Benchmark tool calls against recorded traffic, reporting latency, output size and peak memory.
+
+Each call is timed in an untraced pass and its peak memory measured in a separate
+traced pass, so tracemalloc overhead does not skew the latencies.
+
+Record a session first with YOUTUBE_TRAFFIC_MODE=record, then run for example:
+
+    python benchmark.py calls.json --repeat 5 --latency-scale 0
+
+where calls.json is a list of {"tool": "<tool name>", "arguments": {...}} objects.
+"""
+import argparse
+import json
+import os
+import time
+import tracemalloc
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("calls", help="JSON file with a list of {'tool', 'arguments'} objects")
+    parser.add_argument("--log", default=None, help="Traffic log to replay (defaults to YOUTUBE_TRAFFIC_LOG)")
+    parser.add_argument("--repeat", type=int, default=3, help="Times to run each call")
+    parser.add_argument("--latency-scale", type=float, default=1.0, help="Multiplier for recorded latencies")
+    args = parser.parse_args()
+
+    # Replay settings must be in place before the tools build their clients
+    os.environ['YOUTUBE_TRAFFIC_MODE'] = "replay"
+    os.environ['YOUTUBE_REPLAY_LATENCY_SCALE'] = str(args.latency_scale)
+    if args.log:
+        os.environ['YOUTUBE_TRAFFIC_LOG'] = args.log
+
+    import tools
+
+    with open(args.calls, encoding="utf-8") as f:
+        calls = json.load(f)
+
+    print(f"{'tool':<22}{'mean ms':>10}{'max ms':>10}{'mean out':>10}{'max out':>10}{'peak KiB':>12}")
+    for call in calls:
+        tool = getattr(tools, call['tool'])
+        arguments = call.get('arguments', {})
+
+        # Timing runs untraced, since tracemalloc slows every allocation
+        timings, out_bytes = [], []
+        for _ in range(args.repeat):
+            started = time.perf_counter()
+            result = tool(arguments)
+            timings.append((time.perf_counter() - started) * 1000)
+            out_bytes.append(sum(len(content.text.encode("utf-8")) for content in result))
+            del result
+
+        peaks = []
+        for _ in range(args.repeat):
+            tracemalloc.start()
+            tool(arguments)
+            peaks.append(tracemalloc.get_traced_memory()[1] / 1024)
+            tracemalloc.stop()
+
+        print(f"{call['tool']:<22}{sum(timings) / len(timings):>10.1f}{max(timings):>10.1f}"
+              f"{sum(out_bytes) / len(out_bytes):>10.0f}{max(out_bytes):>10}{max(peaks):>12.1f}")
+
+if __name__ == "__main__":
+    main()
@@ -6,6 +6,7 @@ import tools.get_video_metrics  # Import the get_video_metrics tool to register
 import tools.get_channel_metrics  # Import the get_channel_metrics tool to register it with the MCP
 import tools.get_playlist_metrics  # Import the get_playlist_metrics tool to register it with the MCP server
 import tools.fetch_transcripts  # Import the fetch_transcripts tool to register it with the MCP server
+import tools.batch_query  # Import the batch_query tool to register it with the MCP server
 
 # Entry point to run the server
 if __name__ == "__main__":
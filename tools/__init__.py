@@ -7,6 +7,7 @@ from tools.get_channel_metrics import get_channel_metrics
 from tools.get_playlist_metrics import get_playlist_metrics
 from tools.get_video_metrics import get_video_metrics
 from tools.fetch_transcripts import fetch_transcripts
+from tools.batch_query import batch_query
 
 __all__ = [
     "search_videos",
@@ -15,5 +16,6 @@ __all__ = [
     "get_video_metrics",
     "get_channel_metrics",
     "get_playlist_metrics",
-    "fetch_transcripts"
+    "fetch_transcripts",
+    "batch_query"
 ]
\ No newline at end of file
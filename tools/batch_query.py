@@ -0,0 +1,385 @@
+from server import mcp
+from mcp.types import TextContent
+from typing import Iterator, List
+from concurrent.futures import ThreadPoolExecutor
+import threading
+from utils.tool_utils import YouTubeAPIError, get_youtube_client
+from googleapiclient.errors import HttpError
+from googleapiclient.http import build_http
+from utils.models import (
+    BatchQueryInput, SearchVideosInput, SearchChannelsInput, SearchPlaylistsInput,
+    VideoIdInput, ChannelIdInput, PlaylistIdInput,
+)
+from utils.rendering import render_records, format_fields
+
+# The list endpoints accept at most 50 comma-separated IDs per call
+MAX_IDS_PER_CALL = 50
+MAX_WORKERS = 8
+
+SEARCH_TOOLS = {"search_videos", "search_channels", "search_playlists"}
+# search.list 'type' value and the key holding each result's ID
+SEARCH_TYPES = {
+    "search_videos": ("video", "videoId"),
+    "search_channels": ("channel", "channelId"),
+    "search_playlists": ("playlist", "playlistId"),
+}
+SEARCH_INPUTS = {
+    "search_videos": SearchVideosInput,
+    "search_channels": SearchChannelsInput,
+    "search_playlists": SearchPlaylistsInput,
+}
+ID_INPUTS = {
+    "get_video_metrics": (VideoIdInput, "video_id"),
+    "get_channel_metrics": (ChannelIdInput, "channel_id"),
+    "get_playlist_metrics": (PlaylistIdInput, "playlist_id"),
+}
+# Kind of ID each tool yields to dependents, and the kind it takes from for_each
+PRODUCES = {
+    "search_videos": "video", "get_video_metrics": "video",
+    "search_channels": "channel", "get_channel_metrics": "channel",
+    "search_playlists": "playlist", "get_playlist_metrics": "playlist",
+}
+ACCEPTS = {
+    "get_video_metrics": "video", "get_channel_metrics": "channel", "get_playlist_metrics": "playlist",
+    "search_videos": "channel", "search_playlists": "channel",
+}
+
+# googleapiclient's default transport is not thread-safe, so each worker gets its own,
+# built like the default one (socket timeout, no 308 redirects)
+_thread_local = threading.local()
+
+def _execute(request):
+    if not hasattr(_thread_local, 'http'):
+        _thread_local.http = build_http()
+    return request.execute(http=_thread_local.http)
+
+def _try_execute(request):
+    # One failed call is reported on the sub-requests it affects instead of failing the batch
+    try:
+        return _execute(request)
+    except HttpError as e:
+        return e
+
+def _error_message(error: HttpError) -> str:
+    return f"HTTP {error.status_code}: {error.reason}"
+
+def plan_levels(requests) -> List[list]:
+    """Order sub-requests into levels where each level only depends on earlier ones.
+
+    Sub-requests within the same level are independent and run concurrently.
+    Raises YouTubeAPIError on dependency cycles or incompatible for_each sources.
+    """
+    by_id = {r.id: r for r in requests}
+    depths = {}
+
+    def depth(request, visiting):
+        if request.id in depths:
+            return depths[request.id]
+        if request.id in visiting:
+            raise YouTubeAPIError(f"Dependency cycle involving sub-request '{request.id}'")
+        if request.for_each is None:
+            depths[request.id] = 0
+        else:
+            visiting.add(request.id)
+            depths[request.id] = depth(by_id[request.for_each], visiting) + 1
+        return depths[request.id]
+
+    for r in requests:
+        if r.for_each is not None:
+            source_kind = PRODUCES[by_id[r.for_each].tool]
+            if ACCEPTS.get(r.tool) != source_kind:
+                raise YouTubeAPIError(
+                    f"Sub-request '{r.id}' ({r.tool}) cannot run for each {source_kind} of '{r.for_each}'")
+        depth(r, set())
+
+    levels = [[] for _ in range(max(depths.values()) + 1)]
+    for r in requests:
+        levels[depths[r.id]].append(r)
+    return levels
+
+class BatchExecutor:
+    """Runs planned sub-requests, fusing ID lookups across them into shared list calls."""
+
+    def __init__(self, youtube, pool):
+        self.youtube = youtube
+        self.pool = pool
+        self.api_calls = 0
+        self.search_items = {}
+        self.targets = {}
+        self.produced = {}
+        self.videos = {}
+        self.channels = {}
+        self.playlists = {}
+        self.playlist_videos = {}
+        self.search_errors = {}
+        self.failed_ids = {}
+
+    def _run_all(self, requests):
+        self.api_calls += len(requests)
+        return list(self.pool.map(_try_execute, requests))
+
+    def _lookup(self, kind, ids):
+        """Fetch uncached IDs of one resource in chunked list calls; absent IDs are cached as None."""
+        cache, resource, part = {
+            "video": (self.videos, self.youtube.videos, 'snippet,statistics'),
+            "channel": (self.channels, self.youtube.channels, 'snippet,statistics'),
+            "playlist": (self.playlists, self.youtube.playlists, 'snippet'),
+        }[kind]
+        missing = [i for i in self._missing(cache, ids) if i not in self.failed_ids]
+        return [(cache, chunk, resource().list(part=part, id=','.join(chunk)))
+                for chunk in (missing[start:start + MAX_IDS_PER_CALL]
+                              for start in range(0, len(missing), MAX_IDS_PER_CALL))]
+
+    def _run_lookups(self, lookups):
+        responses = self._run_all([request for _, _, request in lookups])
+        for (cache, chunk, _), response in zip(lookups, responses):
+            if isinstance(response, HttpError):
+                for failed_id in chunk:
+                    self.failed_ids[failed_id] = _error_message(response)
+                continue
+            for item in response.get('items', []):
+                cache[item['id']] = item
+            for missing_id in chunk:
+                cache.setdefault(missing_id, None)
+
+    def run_level(self, level, parsed):
+        # Stage 1: searches, fanned out per channel for dependent searches
+        search_calls = []
+        for r in level:
+            if r.tool not in SEARCH_TOOLS:
+                continue
+            channels = self.produced[r.for_each] if r.for_each else [None]
+            for channel_id in channels:
+                search_calls.append((r.id, self._search_params(r.tool, parsed[r.id], channel_id)))
+        responses = self._run_all([self.youtube.search().list(**params) for _, params in search_calls])
+        for r in level:
+            if r.tool in SEARCH_TOOLS:
+                self.search_items[r.id] = []
+        for (request_id, _), response in zip(search_calls, responses):
+            if isinstance(response, HttpError):
+                self.search_errors.setdefault(request_id, _error_message(response))
+                continue
+            self.search_items[request_id].extend(response.get('items', []))
+
+        # Stage 2: resolve the IDs each sub-request needs looked up
+        for r in level:
+            if r.tool in SEARCH_TOOLS:
+                key = SEARCH_TYPES[r.tool][1]
+                self.targets[r.id] = [item['id'][key] for item in self.search_items[r.id]]
+            elif r.for_each:
+                self.targets[r.id] = list(self.produced[r.for_each])
+            else:
+                self.targets[r.id] = [getattr(parsed[r.id], ID_INPUTS[r.tool][1])]
+
+        # Playlists are resolved first so items are only listed for playlists that exist
+        playlist_targets = [i for r in level if r.tool == "get_playlist_metrics" for i in self.targets[r.id]]
+        self._run_lookups(self._lookup("playlist", playlist_targets))
+        playlist_ids = [pid for pid in self._missing(self.playlist_videos, playlist_targets) if self.playlists.get(pid)]
+        responses = self._run_all([self.youtube.playlistItems().list(part='contentDetails', playlistId=pid, maxResults=50)
+                                   for pid in playlist_ids])
+        for pid, response in zip(playlist_ids, responses):
+            if isinstance(response, HttpError):
+                self.failed_ids[pid] = _error_message(response)
+                continue
+            self.playlist_videos[pid] = [item['contentDetails']['videoId'] for item in response.get('items', [])]
+
+        # Stage 3: one deduplicated, chunked list call per resource across all sub-requests
+        wanted = {"video": [], "channel": []}
+        for r in level:
+            if r.tool in ("search_videos", "get_video_metrics", "search_channels", "get_channel_metrics"):
+                wanted[PRODUCES[r.tool]].extend(self.targets[r.id])
+            elif r.tool == "get_playlist_metrics":
+                for pid in self.targets[r.id]:
+                    wanted["video"].extend(self.playlist_videos.get(pid, []))
+        self._run_lookups(self._lookup("video", wanted["video"]) + self._lookup("channel", wanted["channel"]))
+
+        for r in level:
+            cache = {"video": self.videos, "channel": self.channels, "playlist": self.playlists}[PRODUCES[r.tool]]
+            if r.tool == "search_playlists":
+                self.produced[r.id] = list(dict.fromkeys(self.targets[r.id]))
+            else:
+                self.produced[r.id] = [i for i in dict.fromkeys(self.targets[r.id]) if cache.get(i)]
+
+    @staticmethod
+    def _missing(cache, ids):
+        return [i for i in dict.fromkeys(ids) if i not in cache]
+
+    @staticmethod
+    def _search_params(tool, input_data, channel_id):
+        params = {
+            'part': 'snippet',
+            'q': input_data.query,
+            'type': SEARCH_TYPES[tool][0],
+            'maxResults': input_data.max_results
+        }
+        if tool == "search_videos":
+            params['order'] = input_data.order
+            params['videoDuration'] = input_data.duration
+        if input_data.published_after:
+            params['publishedAfter'] = input_data.published_after
+        if channel_id:
+            params['channelId'] = channel_id
+        return params
+
+    def render(self, r, compact: bool = False) -> Iterator[str]:
+        """Yield a sub-request's heading and then one formatted block per result, lazily."""
+        def described(fields, item):
+            if not compact:
+                description = item['snippet']['description']
+                fields.append(('Description', description[:200] + ('...' if description else '')))
+            return format_fields(item['snippet']['title'], fields, compact)
+
+        heading = f"### {r.id} ({r.tool})"
+        if r.id in self.search_errors:
+            heading += f"\nSome searches failed: {self.search_errors[r.id]}"
+
+        def lookup_failed(kind, target_id):
+            return f"Could not fetch {kind} {target_id}: {self.failed_ids[target_id]}"
+
+        if r.tool == "search_videos":
+            items = [item for item in self.search_items[r.id]
+                     if self.videos.get(item['id']['videoId']) or item['id']['videoId'] in self.failed_ids]
+            yield heading if items else f"{heading}\nNo videos found."
+            for item in items:
+                video = self.videos.get(item['id']['videoId'])
+                if not video:
+                    yield lookup_failed("video", item['id']['videoId'])
+                    continue
+                yield described([
+                    ('Channel', item['snippet']['channelTitle']),
+                    ('Video ID', item['id']['videoId']),
+                    ('Published', item['snippet']['publishedAt']),
+                    ('Views', video['statistics'].get('viewCount', '0')),
+                    ('Likes', video['statistics'].get('likeCount', '0')),
+                    ('Comments', video['statistics'].get('commentCount', '0')),
+                ], item)
+
+        elif r.tool == "search_channels":
+            items = [item for item in self.search_items[r.id]
+                     if self.channels.get(item['id']['channelId']) or item['id']['channelId'] in self.failed_ids]
+            yield f"{heading}\nFound {len(items)} channels:" if items else f"{heading}\nNo channels found."
+            for item in items:
+                channel = self.channels.get(item['id']['channelId'])
+                if not channel:
+                    yield lookup_failed("channel", item['id']['channelId'])
+                    continue
+                yield described([
+                    ('Channel ID', item['id']['channelId']),
+                    ('Created', item['snippet']['publishedAt']),
+                    ('Subscribers', channel['statistics'].get('subscriberCount', '0')),
+                    ('Videos', channel['statistics'].get('videoCount', '0')),
+                    ('Total Views', channel['statistics'].get('viewCount', '0')),
+                ], item)
+
+        elif r.tool == "search_playlists":
+            items = self.search_items[r.id]
+            yield f"{heading}\nFound {len(items)} playlists:" if items else f"{heading}\nNo playlists found."
+            for item in items:
+                yield described([
+                    ('Playlist ID', item['id']['playlistId']),
+                    ('Created', item['snippet']['publishedAt']),
+                ], item)
+
+        else:
+            target_ids = list(dict.fromkeys(self.targets[r.id]))
+            yield heading if target_ids else f"{heading}\nNo results."
+            for target_id in target_ids:
+                if target_id in self.failed_ids:
+                    yield lookup_failed(PRODUCES[r.tool], target_id)
+                elif r.tool == "get_video_metrics":
+                    video = self.videos.get(target_id)
+                    yield format_fields(video['snippet']['title'], [
+                        ('Views', video['statistics'].get('viewCount', '0')),
+                        ('Likes', video['statistics'].get('likeCount', '0')),
+                        ('Comments', video['statistics'].get('commentCount', '0')),
+                    ], compact) if video else f"No video found for the given ID: {target_id}"
+                elif r.tool == "get_channel_metrics":
+                    channel = self.channels.get(target_id)
+                    yield format_fields(channel['snippet']['title'], [
+                        ('Subscribers', channel['statistics'].get('subscriberCount', '0')),
+                        ('Total Views', channel['statistics'].get('viewCount', '0')),
+                        ('Videos', channel['statistics'].get('videoCount', '0')),
+                    ], compact) if channel else f"No channel found for the given ID: {target_id}"
+                else:
+                    playlist = self.playlists.get(target_id)
+                    video_ids = self.playlist_videos.get(target_id, [])
+                    total_views = sum(int(self.videos[v]['statistics'].get('viewCount', 0))
+                                      for v in video_ids if self.videos.get(v))
+                    yield format_fields(playlist['snippet']['title'], [
+                        ('Playlist ID', target_id),
+                        ('Items', len(video_ids)),
+                        ('Total Views', total_views),
+                    ], compact) if playlist else f"No playlist found for the given ID: {target_id}"
+
+@mcp.tool()
+def batch_query(arguments: dict) -> List[TextContent]:
+    """Run several search and metrics requests together using as few API calls as possible.
+
+    This function takes a declarative list of sub-requests, each naming one of the search or
+    metrics tools and its arguments. A sub-request can set 'for_each' to the id of an earlier
+    sub-request to run once per channel, video or playlist that request returned (for example
+    get_channel_metrics or search_videos for each result of search_channels). Sub-requests are
+    ordered by these dependencies; independent ones run concurrently, and all video, channel
+    and playlist lookups of a level are deduplicated and merged into shared list calls of up
+    to 50 IDs, reusing anything already fetched earlier in the batch. A failed API call is
+    reported on the results it affects instead of failing the whole batch.
+
+    Args:
+        arguments: A dictionary containing:
+            - requests (list): Sub-requests (1 to 20), each a dictionary with:
+                - id (str): Name used to reference this sub-request (required, unique).
+                - tool (str): 'search_videos', 'search_channels', 'search_playlists',
+                  'get_video_metrics', 'get_channel_metrics' or 'get_playlist_metrics' (required).
+                - arguments (dict, optional): Arguments accepted by the standalone tool. The ID
+                  argument of metrics tools is omitted when for_each is set.
+                - for_each (str, optional): ID of the sub-request whose results this one runs for.
+                  Metrics tools take results of their own kind; search_videos and search_playlists
+                  take channels and search within each of them.
+            - max_bytes, max_tokens, cursor, compact (optional): Output limits and format, see utils.rendering.
+              Continuing with a cursor re-runs the whole batch, spending its API quota again.
+
+    Returns:
+        List[TextContent]: A TextContent with a summary of the plan and the number of API calls
+            made, followed by each sub-request in request order under a '### <id> (<tool>)'
+            heading, with results formatted like the output of the corresponding standalone tool.
+            If the output limits are reached, a final TextContent holds the cursor to continue from.
+
+    Raises:
+        YouTubeAPIError: If the API key is missing, the input arguments are invalid (via Pydantic),
+            the sub-requests form a cycle or an incompatible for_each, the API request fails,
+            or an unexpected error occurs.
+    """
+    try:
+        input_data = BatchQueryInput(**arguments)
+        parsed = {}
+        for r in input_data.requests:
+            if r.tool in SEARCH_TOOLS:
+                parsed[r.id] = SEARCH_INPUTS[r.tool](**r.arguments)
+            elif r.for_each is None:
+                parsed[r.id] = ID_INPUTS[r.tool][0](**r.arguments)
+    except ValueError as e:
+        raise YouTubeAPIError(f"Invalid input arguments: {e}")
+
+    levels = plan_levels(input_data.requests)
+    youtube = get_youtube_client()
+
+    try:
+        with ThreadPoolExecutor(max_workers=MAX_WORKERS) as pool:
+            executor = BatchExecutor(youtube, pool)
+            for level in levels:
+                executor.run_level(level, parsed)
+
+        # Each result is its own record so the size limit and cursor can fall inside a sub-request
+        blocks = (block for r in input_data.requests for block in executor.render(r, input_data.compact))
+        return render_records(
+            blocks,
+            lambda block: block,
+            input_data,
+            header=lambda count: f"Ran {len(input_data.requests)} sub-requests in {len(levels)} stages "
+                                 f"with {executor.api_calls} API calls.\n\n",
+        )
+
+    except HttpError as e:
+        raise YouTubeAPIError(f"YouTube API error in batch query: {e}")
+    except Exception as e:
+        raise YouTubeAPIError(f"Unexpected error in batch query: {e}")
@@ -1,8 +1,10 @@
 from server import mcp
 from mcp.types import TextContent
 from typing import List
-from utils.tool_utils import YouTubeAPIError
-from youtube_transcript_api import YouTubeTranscriptApi, NoTranscriptFound, TranscriptsDisabled
+from utils.tool_utils import YouTubeAPIError, get_transcript_api
+from utils.transcript_utils import segment_snippets, summarize_segments, format_segment
+from utils.rendering import render_records
+from youtube_transcript_api import NoTranscriptFound, TranscriptsDisabled
 
 @mcp.tool()
 def fetch_transcripts(arguments: dict) -> List[TextContent]:
@@ -28,17 +30,29 @@ def fetch_transcripts(arguments: dict) -> List[TextContent]:
     is returned as a single TextContent object with timestamped text entries. If no transcript
     is available, a message indicating the reason is returned.
 
+    Before returning, the snippets are streamed through a post-processing stage that drops
+    caption annotations, removes filler words and the repeated text of rolling captions from
+    auto-generated transcripts, and merges snippets into sentence-level segments. The 'summary'
+    format keeps only the most informative segments. Output stops before max_chars, max_bytes
+    or max_tokens is exceeded and then ends with a cursor to continue from.
+
     Args:
         arguments: A dictionary containing:
             - video_id (str, optional): The YouTube video ID.
             - video_url (str, optional): The YouTube video URL (e.g., 'https://www.youtube.com/watch?v=VIDEO_ID').
             - language_code (str, optional): Language code for the transcript (e.g., 'en'). Defaults to 'en'.
+            - output_format (str, optional): 'segments' (timestamped, deduplicated sentences),
+              'summary' (extractive summary of the segments) or 'raw' (unprocessed text). Defaults to 'segments'.
+            - max_chars (int, optional): Maximum characters of transcript text to return (100 to 500000). Defaults to 20000.
+            - summary_sentences (int, optional): Number of segments kept by the 'summary' format (1 to 100). Defaults to 10.
+            - max_bytes, max_tokens, cursor (optional): Output limits, see utils.rendering.
             Either video_id or video_url must be provided.
 
     Returns:
         List[TextContent]: A list containing a single TextContent object with the transcript
             as a formatted string (timestamp and text). If no transcript is available or the
-            video is not found, returns a TextContent with an appropriate message.
+            video is not found, returns a TextContent with an appropriate message. If the output
+            limits are reached, a final TextContent holds the cursor to continue from.
 
     Raises:
         YouTubeAPIError: If the API key is missing, the API request fails, the input arguments
@@ -51,7 +65,7 @@ def fetch_transcripts(arguments: dict) -> List[TextContent]:
     except ValueError as e:
         raise YouTubeAPIError(f"Invalid input arguments: {e}")
     
-    ytt_api = YouTubeTranscriptApi()
+    ytt_api = get_transcript_api()
 
     try:
         # Try to fetch transcript directly first
@@ -67,15 +81,21 @@ def fetch_transcripts(arguments: dict) -> List[TextContent]:
             except NoTranscriptFound:
                 return [TextContent(type="text", text=f"No transcript available for this video in any language.")]
         
-        transcript_text = "".join(snippet.text for snippet in transcript.snippets)
+        def header(count):
+            return f"Transcript for video ID {input_data.video_id} (language: {input_data.language_code}):\n\n"
+
+        empty_message = "Transcript is empty or unavailable."
 
-        if not transcript_text.strip():
-            return [TextContent(type="text", text="Transcript is empty or unavailable.")]
+        if input_data.output_format == "raw":
+            return render_records(transcript.snippets, lambda snippet: snippet.text or None, input_data,
+                                  header=header, empty_message=empty_message, separator="",
+                                  max_chars=input_data.max_chars)
 
-        return [TextContent(
-            type="text",
-            text=f"Transcript for video ID {input_data.video_id} (language: {input_data.language_code}):\n\n{transcript_text}"
-        )]
+        segments = segment_snippets(transcript.snippets, transcript.is_generated)
+        if input_data.output_format == "summary":
+            segments = summarize_segments(list(segments), input_data.summary_sentences)
+        return render_records(segments, format_segment, input_data, header=header,
+                              empty_message=empty_message, separator="\n", max_chars=input_data.max_chars)
 
     except TranscriptsDisabled:
         return [TextContent(type="text", text="Transcripts are disabled for this video or access is restricted.")]
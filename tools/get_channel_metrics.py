@@ -4,6 +4,7 @@ from typing import List
 from utils.tool_utils import YouTubeAPIError, get_youtube_client
 from googleapiclient.errors import HttpError
 from utils.models import ChannelIdInput
+from utils.rendering import render_records, format_fields
 
 @mcp.tool()
 def get_channel_metrics(arguments: dict) -> List[TextContent]:
@@ -15,6 +16,7 @@ def get_channel_metrics(arguments: dict) -> List[TextContent]:
     Args:
         arguments: A dictionary containing:
             - channel_id (str): The YouTube channel ID (required).
+            - max_bytes, max_tokens (optional): Output limits, see utils.rendering.
 
     Returns:
         List[TextContent]: A list containing a single TextContent object with a formatted string
@@ -42,21 +44,14 @@ def get_channel_metrics(arguments: dict) -> List[TextContent]:
         if not items:
             return [TextContent(type="text", text="No channel found for the given ID.")]
 
-        item = items[0]
-        channel_info = {
-            'title': item['snippet']['title'],
-            'subscriber_count': item['statistics'].get('subscriberCount', '0'),
-            'view_count': item['statistics'].get('viewCount', '0'),
-            'video_count': item['statistics'].get('videoCount', '0')
-        }
+        def format_channel(item):
+            return format_fields(item['snippet']['title'], [
+                ('Subscribers', item['statistics'].get('subscriberCount', '0')),
+                ('Total Views', item['statistics'].get('viewCount', '0')),
+                ('Videos', item['statistics'].get('videoCount', '0')),
+            ])
 
-        return [TextContent(
-            type="text",
-            text=(f"**{channel_info['title']}**\n"
-                  f"Subscribers: {channel_info['subscriber_count']}\n"
-                  f"Total Views: {channel_info['view_count']}\n"
-                  f"Videos: {channel_info['video_count']}")
-        )]
+        return render_records(items[:1], format_channel, input_data)
 
     except HttpError as e:
         raise YouTubeAPIError(f"YouTube API error for channel ID '{input_data.channel_id}': {e}")
@@ -4,6 +4,7 @@ from typing import List
 from utils.tool_utils import YouTubeAPIError, get_youtube_client
 from googleapiclient.errors import HttpError
 from utils.models import PlaylistIdInput
+from utils.rendering import render_records, format_fields
 
 @mcp.tool()
 def get_playlist_metrics(arguments: dict) -> List[TextContent]:
@@ -15,6 +16,7 @@ def get_playlist_metrics(arguments: dict) -> List[TextContent]:
     Args:
         arguments: A dictionary containing:
             - playlist_id (str): The YouTube playlist ID (required).
+            - max_bytes, max_tokens (optional): Output limits, see utils.rendering.
 
     Returns:
         List[TextContent]: A list containing a single TextContent object with a formatted string
@@ -61,13 +63,11 @@ def get_playlist_metrics(arguments: dict) -> List[TextContent]:
             ).execute()
             total_views = sum(int(item['statistics'].get('viewCount', 0)) for item in videos_response.get('items', []))
 
-        return [TextContent(
-            type="text",
-            text=(f"**{playlist_title}**\n"
-                  f"Playlist ID: {input_data.playlist_id}\n"
-                  f"Items: {item_count}\n"
-                  f"Total Views: {total_views}")
-        )]
+        return render_records([playlist_title], lambda title: format_fields(title, [
+            ('Playlist ID', input_data.playlist_id),
+            ('Items', item_count),
+            ('Total Views', total_views),
+        ]), input_data)
 
     except HttpError as e:
         raise YouTubeAPIError(f"YouTube API error for playlist ID '{input_data.playlist_id}': {e}")
@@ -4,6 +4,7 @@ from typing import List
 from utils.tool_utils import YouTubeAPIError, get_youtube_client
 from googleapiclient.errors import HttpError
 from utils.models import VideoIdInput
+from utils.rendering import render_records, format_fields
 
 @mcp.tool()
 def get_video_metrics(arguments: dict) -> List[TextContent]:
@@ -15,6 +16,7 @@ def get_video_metrics(arguments: dict) -> List[TextContent]:
     Args:
         arguments: A dictionary containing:
             - video_id (str): The YouTube video ID (required).
+            - max_bytes, max_tokens (optional): Output limits, see utils.rendering.
 
     Returns:
         List[TextContent]: A list containing a single TextContent object with a formatted string
@@ -42,21 +44,14 @@ def get_video_metrics(arguments: dict) -> List[TextContent]:
         if not items:
             return [TextContent(type="text", text="No video found for the given ID.")]
 
-        item = items[0]
-        video_info = {
-            'title': item['snippet']['title'],
-            'view_count': item['statistics'].get('viewCount', '0'),
-            'like_count': item['statistics'].get('likeCount', '0'),
-            'comment_count': item['statistics'].get('commentCount', '0')
-        }
+        def format_video(item):
+            return format_fields(item['snippet']['title'], [
+                ('Views', item['statistics'].get('viewCount', '0')),
+                ('Likes', item['statistics'].get('likeCount', '0')),
+                ('Comments', item['statistics'].get('commentCount', '0')),
+            ])
 
-        return [TextContent(
-            type="text",
-            text=(f"**{video_info['title']}**\n"
-                  f"Views: {video_info['view_count']}\n"
-                  f"Likes: {video_info['like_count']}\n"
-                  f"Comments: {video_info['comment_count']}")
-        )]
+        return render_records(items[:1], format_video, input_data)
 
     except HttpError as e:
         raise YouTubeAPIError(f"YouTube API error for video ID '{input_data.video_id}': {e}")
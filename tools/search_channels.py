@@ -5,6 +5,7 @@ from utils.tool_utils import YouTubeAPIError, get_youtube_client
 from googleapiclient.errors import HttpError
 from tools.get_channel_metrics import get_channel_metrics
 from utils.models import SearchChannelsInput
+from utils.rendering import render_records, format_fields
 
 @mcp.tool()
 def search_channels(arguments: dict) -> List[TextContent]:
@@ -20,12 +21,14 @@ def search_channels(arguments: dict) -> List[TextContent]:
             - query (str): The search query (required).
             - max_results (int, optional): Maximum number of results (1 to 50). Defaults to 25.
             - published_after (str, optional): RFC 3339 timestamp (e.g., '2023-01-01T00:00:00Z') to filter channels created after this date.
+            - max_bytes, max_tokens, cursor, compact (optional): Output limits and format, see utils.rendering.
 
     Returns:
         List[TextContent]: A list containing a single TextContent object with a formatted string
             listing all found channels, including their title, channel ID, creation date, 
             truncated description, subscriber count, video count, and total view count.
             If no channels are found, returns a single TextContent with a "No channels found" message.
+            If the output limits are reached, a final TextContent holds the cursor to continue from.
 
     Raises:
         YouTubeAPIError: If the API key is missing, the API request fails, the input arguments are invalid (via Pydantic), or an unexpected error occurs.
@@ -50,47 +53,34 @@ def search_channels(arguments: dict) -> List[TextContent]:
 
         search_response = youtube.search().list(**search_params).execute()
 
-        channels = []
-        for item in search_response.get('items', []):
+        def format_channel(item):
             channel_id = item['id']['channelId']
-            channel_info = {
-                'channel_id': channel_id,
-                'title': item['snippet']['title'],
-                'description': item['snippet']['description'][:200] + ('...' if item['snippet']['description'] else ''),
-                'published_at': item['snippet']['publishedAt']
-            }
 
             # Fetch metrics using get_channel_metrics
             metrics_response = get_channel_metrics({"channel_id": channel_id})
             if metrics_response[0].text.startswith("No channel found"):
-                continue
+                return None
             metrics_text = metrics_response[0].text.split('\n')
             subscriber_count = next((line.split(': ')[1] for line in metrics_text if line.startswith('Subscribers')), '0')
             video_count = next((line.split(': ')[1] for line in metrics_text if line.startswith('Videos')), '0')
             view_count = next((line.split(': ')[1] for line in metrics_text if line.startswith('Total Views')), '0')
 
-            channel_info.update({
-                'subscriber_count': subscriber_count,
-                'video_count': video_count,
-                'view_count': view_count
-            })
-            channels.append(channel_info)
+            fields = [
+                ('Channel ID', channel_id),
+                ('Created', item['snippet']['publishedAt']),
+                ('Subscribers', subscriber_count),
+                ('Videos', video_count),
+                ('Total Views', view_count),
+            ]
+            if not input_data.compact:
+                description = item['snippet']['description']
+                fields.append(('Description', description[:200] + ('...' if description else '')))
+            return format_fields(item['snippet']['title'], fields, input_data.compact)
 
-        if not channels:
-            return [TextContent(type="text", text="No channels found.")]
-
-        return [TextContent(
-            type="text",
-            text=f"Found {len(channels)} channels:\n\n" +
-                 "\n\n".join([f"**{c['title']}**\n"
-                              f"Channel ID: {c['channel_id']}\n"
-                              f"Created: {c['published_at']}\n"
-                              f"Subscribers: {c['subscriber_count']}\n"
-                              f"Videos: {c['video_count']}\n"
-                              f"Total Views: {c['view_count']}\n"
-                              f"Description: {c['description']}"
-                              for c in channels])
-        )]
+        # Metrics are only fetched for results that fit within the output limits
+        return render_records(search_response.get('items', []), format_channel, input_data,
+                              header=lambda count: f"Found {count} channels:\n\n",
+                              empty_message="No channels found.")
 
     except HttpError as e:
         raise YouTubeAPIError(f"YouTube API error for query '{input_data.query}': {e}")
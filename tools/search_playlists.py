@@ -4,6 +4,7 @@ from typing import List
 from utils.tool_utils import YouTubeAPIError, get_youtube_client
 from googleapiclient.errors import HttpError
 from utils.models import SearchPlaylistsInput
+from utils.rendering import render_records, format_fields
 
 @mcp.tool()
 def search_playlists(arguments: dict) -> List[TextContent]:
@@ -18,12 +19,14 @@ def search_playlists(arguments: dict) -> List[TextContent]:
             - query (str): The search query (required).
             - max_results (int, optional): Maximum number of results (1 to 50). Defaults to 25.
             - published_after (str, optional): RFC 3339 timestamp (e.g., '2023-01-01T00:00:00Z') to filter playlists created after this date.
+            - max_bytes, max_tokens, cursor, compact (optional): Output limits and format, see utils.rendering.
 
     Returns:
         List[TextContent]: A list containing a single TextContent object with a formatted string
             listing all found playlists, including their title, playlist ID, creation date, and
             truncated description. If no playlists are found, returns a single TextContent with a
-            "No playlists found" message.
+            "No playlists found" message. If the output limits are reached, a final TextContent
+            holds the cursor to continue from.
 
     Raises:
         YouTubeAPIError: If the API key is missing, the API request fails, or the input arguments are invalid (via Pydantic).
@@ -48,28 +51,19 @@ def search_playlists(arguments: dict) -> List[TextContent]:
 
         search_response = youtube.search().list(**search_params).execute()
 
-        playlists = []
-        for item in search_response.get('items', []):
-            playlist_info = {
-                'playlist_id': item['id']['playlistId'],
-                'title': item['snippet']['title'],
-                'description': item['snippet']['description'][:200] + ('...' if item['snippet']['description'] else ''),
-                'published_at': item['snippet']['publishedAt']
-            }
-            playlists.append(playlist_info)
+        def format_playlist(item):
+            fields = [
+                ('Playlist ID', item['id']['playlistId']),
+                ('Created', item['snippet']['publishedAt']),
+            ]
+            if not input_data.compact:
+                description = item['snippet']['description']
+                fields.append(('Description', description[:200] + ('...' if description else '')))
+            return format_fields(item['snippet']['title'], fields, input_data.compact)
 
-        if not playlists:
-            return [TextContent(type="text", text="No playlists found.")]
-
-        return [TextContent(
-            type="text",
-            text=f"Found {len(playlists)} playlists:\n\n" +
-                 "\n\n".join([f"**{p['title']}**\n"
-                              f"Playlist ID: {p['playlist_id']}\n"
-                              f"Created: {p['published_at']}\n"
-                              f"Description: {p['description']}"
-                              for p in playlists])
-        )]
+        return render_records(search_response.get('items', []), format_playlist, input_data,
+                              header=lambda count: f"Found {count} playlists:\n\n",
+                              empty_message="No playlists found.")
 
     except HttpError as e:
         raise YouTubeAPIError(f"YouTube API error for query '{input_data.query}': {e}")
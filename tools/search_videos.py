@@ -5,6 +5,7 @@ from utils.tool_utils import YouTubeAPIError, get_youtube_client
 from googleapiclient.errors import HttpError
 from tools.get_video_metrics import get_video_metrics
 from utils.models import SearchVideosInput
+from utils.rendering import render_records, format_fields
 
 @mcp.tool()
 def search_videos(arguments: dict) -> List[TextContent]:
@@ -23,12 +24,14 @@ def search_videos(arguments: dict) -> List[TextContent]:
             - order (str, optional): Sort order ('relevance', 'date', 'rating', 'viewCount'). Defaults to 'relevance'.
             - duration (str, optional): Video duration filter ('medium', 'long'). Defaults to 'medium'.
             - published_after (str, optional): RFC 3339 timestamp (e.g., '2023-01-01T00:00:00Z') to filter videos uploaded after this date.
+            - max_bytes, max_tokens, cursor, compact (optional): Output limits and format, see utils.rendering.
 
     Returns:
         List[TextContent]: A list of TextContent objects, each containing a formatted string
             with video details (title, channel, video ID, publication date, truncated description,
             view count, like count, and comment count). If no videos are found, returns a single
-            TextContent with a "No videos found" message.
+            TextContent with a "No videos found" message. If the output limits are reached, a final
+            TextContent holds the cursor to continue from.
 
     Raises:
         YouTubeAPIError: If the API key is missing, the API request fails, the input arguments are invalid (via Pydantic), or an unexpected error occurs.
@@ -55,42 +58,34 @@ def search_videos(arguments: dict) -> List[TextContent]:
         
         search_response = youtube.search().list(**search_params).execute()
         
-        results = []
-        for item in search_response.get('items', []):
+        def format_video(item):
             video_id = item['id']['videoId']
-            description = item['snippet']['description']
-            truncated_desc = description[:200] + ('...' if description else '')
-            video_info = {
-                'video_id': video_id,
-                'title': item['snippet']['title'],
-                'description': truncated_desc,
-                'channel_title': item['snippet']['channelTitle'],
-                'published_at': item['snippet']['publishedAt'],
-                'thumbnail_url': item['snippet']['thumbnails'].get('default', {}).get('url', '')
-            }
-            
+
             # Fetch metrics using get_video_metrics
             metrics_response = get_video_metrics({"video_id": video_id})
             if metrics_response[0].text.startswith("No video found"):
-                continue
+                return None
             metrics_text = metrics_response[0].text.split('\n')
             view_count = next((line.split(': ')[1] for line in metrics_text if line.startswith('Views')), '0')
             like_count = next((line.split(': ')[1] for line in metrics_text if line.startswith('Likes')), '0')
             comment_count = next((line.split(': ')[1] for line in metrics_text if line.startswith('Comments')), '0')
-            
-            results.append(TextContent(
-                type="text",
-                text=(f"**{video_info['title']}**\n"
-                      f"Channel: {video_info['channel_title']}\n"
-                      f"Video ID: {video_info['video_id']}\n"
-                      f"Published: {video_info['published_at']}\n"
-                      f"Views: {view_count}\n"
-                      f"Likes: {like_count}\n"
-                      f"Comments: {comment_count}\n"
-                      f"Description: {video_info['description']}")
-            ))
-        
-        return results if results else [TextContent(type="text", text="No videos found.")]
+
+            fields = [
+                ('Channel', item['snippet']['channelTitle']),
+                ('Video ID', video_id),
+                ('Published', item['snippet']['publishedAt']),
+                ('Views', view_count),
+                ('Likes', like_count),
+                ('Comments', comment_count),
+            ]
+            if not input_data.compact:
+                description = item['snippet']['description']
+                fields.append(('Description', description[:200] + ('...' if description else '')))
+            return format_fields(item['snippet']['title'], fields, input_data.compact)
+
+        # Metrics are only fetched for results that fit within the output limits
+        return render_records(search_response.get('items', []), format_video, input_data,
+                              empty_message="No videos found.", per_record=True)
     
     except HttpError as e:
         raise YouTubeAPIError(f"YouTube API error for query '{input_data.query}': {e}")
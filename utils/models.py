@@ -1,8 +1,35 @@
 from pydantic import BaseModel, Field, field_validator, model_validator
-from typing import Optional
+from typing import List, Optional
 import re
 
-class SearchVideosInput(BaseModel):
+class LimitOptions(BaseModel):
+    max_bytes: Optional[int] = Field(32000, ge=256, le=1000000, description="Maximum size of the response in bytes")
+    max_tokens: Optional[int] = Field(None, ge=64, le=250000, description="Maximum estimated tokens in the response")
+
+    @model_validator(mode='before')
+    @classmethod
+    def reject_unsupported_options(cls, values):
+        # Output options of other tools would otherwise be silently ignored
+        if isinstance(values, dict):
+            unsupported = {"cursor", "compact"} & set(values) - set(cls.model_fields)
+            if unsupported:
+                raise ValueError(f"Unsupported options for this tool: {sorted(unsupported)}")
+        return values
+
+class PagedOptions(LimitOptions):
+    cursor: Optional[str] = Field(None, description="Continuation cursor from a truncated response")
+
+    @field_validator("cursor")
+    @classmethod
+    def validate_cursor(cls, v):
+        if v is not None and not re.match(r'^\d+(:\d+)?$', v):
+            raise ValueError(f"Invalid cursor: {v}. Pass the cursor returned by a truncated response")
+        return v
+
+class RenderOptions(PagedOptions):
+    compact: Optional[bool] = Field(False, description="Render one line per result and omit descriptions")
+
+class SearchVideosInput(RenderOptions):
     query: str = Field(..., min_length=1, description="The search query (required)")
     max_results: Optional[int] = Field(25, ge=1, le=50, description="Maximum number of results (1 to 50)")
     order: Optional[str] = Field("relevance", description="Sort order: relevance, date, rating, viewCount")
@@ -32,7 +59,7 @@ class SearchVideosInput(BaseModel):
             raise ValueError(f"Invalid published_after format: {v}. Must be RFC 3339 (e.g., 2023-01-01T00:00:00Z)")
         return v
 
-class SearchChannelsInput(BaseModel):
+class SearchChannelsInput(RenderOptions):
     query: str = Field(..., min_length=1, description="The search query (required)")
     max_results: Optional[int] = Field(25, ge=1, le=50, description="Maximum number of results (1 to 50)")
     published_after: Optional[str] = Field(None, description="RFC 3339 timestamp (e.g., 2023-01-01T00:00:00Z)")
@@ -44,7 +71,7 @@ class SearchChannelsInput(BaseModel):
             raise ValueError(f"Invalid published_after format: {v}. Must be RFC 3339 (e.g., 2023-01-01T00:00:00Z)")
         return v
 
-class SearchPlaylistsInput(BaseModel):
+class SearchPlaylistsInput(RenderOptions):
     query: str = Field(..., min_length=1, description="The search query (required)")
     max_results: Optional[int] = Field(25, ge=1, le=50, description="Maximum number of results (1 to 50)")
     published_after: Optional[str] = Field(None, description="RFC 3339 timestamp (e.g., 2023-01-01T00:00:00Z)")
@@ -56,19 +83,22 @@ class SearchPlaylistsInput(BaseModel):
             raise ValueError(f"Invalid published_after format: {v}. Must be RFC 3339 (e.g., 2023-01-01T00:00:00Z)")
         return v
 
-class VideoIdInput(BaseModel):
+class VideoIdInput(LimitOptions):
     video_id: str = Field(..., min_length=1, description="The YouTube video ID (required)")
 
-class ChannelIdInput(BaseModel):
+class ChannelIdInput(LimitOptions):
     channel_id: str = Field(..., min_length=1, description="The YouTube channel ID (required)")
 
-class PlaylistIdInput(BaseModel):
+class PlaylistIdInput(LimitOptions):
     playlist_id: str = Field(..., min_length=1, description="The YouTube playlist ID (required)")
 
-class FetchTranscriptsInput(BaseModel):
+class FetchTranscriptsInput(PagedOptions):
     video_id: Optional[str] = Field(None, min_length=1, description="The YouTube video ID")
     video_url: Optional[str] = Field(None, description="The YouTube video URL")
     language_code: Optional[str] = Field("en", description="Language code for the transcript (e.g., 'en')")
+    output_format: Optional[str] = Field("segments", description="Output format: segments, summary, raw")
+    max_chars: Optional[int] = Field(20000, ge=100, le=500000, description="Maximum characters of transcript text to return")
+    summary_sentences: Optional[int] = Field(10, ge=1, le=100, description="Number of segments to keep in summary format")
 
     @model_validator(mode='before')
     @classmethod
@@ -104,4 +134,52 @@ class FetchTranscriptsInput(BaseModel):
     def validate_language_code(cls, v):
         if not re.match(r'^[a-z]{2}(-[A-Z]{2})?$', v):
             raise ValueError(f"Invalid language code: {v}. Must be a valid ISO 639-1 code (e.g., 'en', 'en-US')")
-        return v
\ No newline at end of file
+        return v
+
+    @field_validator("output_format")
+    @classmethod
+    def validate_output_format(cls, v):
+        valid_formats = {"segments", "summary", "raw"}
+        if v not in valid_formats:
+            raise ValueError(f"Invalid output_format: {v}. Must be one of {valid_formats}")
+        return v
+
+BATCH_TOOLS = {
+    "search_videos", "search_channels", "search_playlists",
+    "get_video_metrics", "get_channel_metrics", "get_playlist_metrics",
+}
+
+class BatchSubRequest(BaseModel):
+    id: str = Field(..., min_length=1, description="Name used to reference this sub-request's results (required)")
+    tool: str = Field(..., description="Tool to run: search_videos, search_channels, search_playlists, get_video_metrics, get_channel_metrics, get_playlist_metrics")
+    arguments: dict = Field(default_factory=dict, description="Arguments for the tool, as accepted by the standalone tool")
+    for_each: Optional[str] = Field(None, description="ID of an earlier sub-request whose results this one runs for")
+
+    @field_validator("tool")
+    @classmethod
+    def validate_tool(cls, v):
+        if v not in BATCH_TOOLS:
+            raise ValueError(f"Invalid tool: {v}. Must be one of {BATCH_TOOLS}")
+        return v
+
+    @field_validator("arguments")
+    @classmethod
+    def validate_arguments(cls, v):
+        output_options = set(v) & set(RenderOptions.model_fields)
+        if output_options:
+            raise ValueError(f"Output options {sorted(output_options)} apply to the whole batch, not to sub-requests")
+        return v
+
+class BatchQueryInput(RenderOptions):
+    requests: List[BatchSubRequest] = Field(..., min_length=1, max_length=20, description="Sub-requests to plan and run (1 to 20)")
+
+    @model_validator(mode='after')
+    def check_references(self):
+        ids = [r.id for r in self.requests]
+        duplicates = {i for i in ids if ids.count(i) > 1}
+        if duplicates:
+            raise ValueError(f"Duplicate sub-request ids: {duplicates}")
+        for r in self.requests:
+            if r.for_each is not None and r.for_each not in ids:
+                raise ValueError(f"Sub-request '{r.id}' references unknown sub-request '{r.for_each}'")
+        return self
@@ -0,0 +1,134 @@
+import io
+from typing import Any, Callable, Iterable, List, Optional
+from mcp.types import TextContent
+
+# Rough token estimate used for max_tokens; avoids depending on a specific tokenizer
+BYTES_PER_TOKEN = 4
+# Widest header count and cursor budgeted for before any record is accepted
+MAX_HEADER_COUNT = 999999
+MAX_CURSOR = "999999:99999999"
+
+def format_fields(title: str, fields: list, compact: bool = False) -> str:
+    """Format a titled record as bold title plus 'Label: value' lines, or a single line if compact."""
+    if compact:
+        return " | ".join([title] + [f"{label}: {value}" for label, value in fields])
+    return "\n".join([f"**{title}**"] + [f"{label}: {value}" for label, value in fields])
+
+def parse_cursor(cursor: Optional[str]) -> tuple[int, int]:
+    """Split a cursor of the form '<record index>[:<character offset>]' into its parts."""
+    if not cursor:
+        return 0, 0
+    index, _, offset = cursor.partition(":")
+    return int(index), int(offset or 0)
+
+def _truncation_note(cursor: Optional[str]) -> str:
+    if cursor is None:
+        return "[Output truncated to stay within the size limit.]"
+    return f"[Output truncated to stay within the size limit. Pass cursor='{cursor}' to continue.]"
+
+def _byte_limit(options) -> Optional[int]:
+    limits = [limit for limit in (options.max_bytes,
+                                  options.max_tokens * BYTES_PER_TOKEN if options.max_tokens else None)
+              if limit is not None]
+    return min(limits) if limits else None
+
+def _clip(text: str, max_bytes: int) -> str:
+    return text.encode("utf-8")[:max_bytes].decode("utf-8", errors="ignore")
+
+def render_records(records: Iterable[Any], format_record: Callable[[Any], Optional[str]], options, *,
+                   header: Optional[Callable[[int], str]] = None, empty_message: str = "No results.",
+                   separator: Optional[str] = None, max_chars: Optional[int] = None,
+                   per_record: bool = False) -> List[TextContent]:
+    """Render records incrementally into TextContent within the caller's size limits.
+
+    Records are consumed lazily and formatted one at a time, so nothing past the output
+    limit is fetched or formatted. format_record may return None to skip a record.
+    Rendering starts at options.cursor and stops before the response, including its
+    header and truncation note, would exceed options.max_bytes or options.max_tokens
+    (estimated at BYTES_PER_TOKEN bytes per token), or before the records exceed max_chars.
+    The response then ends with a note carrying the cursor to continue from. A record
+    that does not fit on its own is split, and the cursor points inside it.
+
+    Args:
+        records: Iterable of records in output order.
+        format_record: Returns the text for one record, or None to leave it out.
+        options: Input model with max_bytes and max_tokens (LimitOptions), optionally with
+            cursor (PagedOptions) and compact (RenderOptions). Without a cursor field the
+            truncation note offers no cursor.
+        header: Optional callable building a header from the number of rendered records.
+        empty_message: Text returned when no record is rendered.
+        separator: Text between records. Defaults to a blank line, or a newline when compact.
+        max_chars: Optional extra limit on the number of characters of rendered records.
+        per_record: Return one TextContent per record instead of a single joined one.
+
+    Returns:
+        List[TextContent]: The rendered records, followed by a truncation note if the output
+            was cut short.
+    """
+    paged = hasattr(options, 'cursor')
+    if separator is None:
+        separator = "\n" if getattr(options, 'compact', False) else "\n\n"
+    start, offset = parse_cursor(getattr(options, 'cursor', None))
+
+    byte_limit = _byte_limit(options)
+    if byte_limit is not None:
+        byte_limit -= len(_truncation_note(MAX_CURSOR if paged else None).encode("utf-8"))
+        if header:
+            byte_limit -= len(header(MAX_HEADER_COUNT).encode("utf-8"))
+
+    body = io.StringIO()
+    parts: List[str] = []
+    used_bytes = used_chars = count = 0
+    next_cursor = None
+
+    for index, record in enumerate(records):
+        if index < start:
+            continue
+        text = format_record(record)
+        if text is None:
+            continue
+        consumed = offset if index == start else 0
+        text = text[consumed:]
+
+        piece = text if per_record or not count else separator + text
+        size = len(piece.encode("utf-8"))
+        over_bytes = byte_limit is not None and used_bytes + size > byte_limit
+        over_chars = max_chars is not None and used_chars + len(piece) > max_chars
+        if over_bytes or over_chars:
+            next_cursor = str(index)
+            if count:
+                break
+            # A single record larger than the limit is split; the cursor resumes inside it
+            if max_chars is not None:
+                piece = piece[:max_chars]
+            if byte_limit is not None:
+                piece = _clip(piece, max(byte_limit, 0))
+            piece = piece or text[:1]
+            next_cursor = f"{index}:{consumed + len(piece)}"
+            size = len(piece.encode("utf-8"))
+
+        if per_record:
+            parts.append(piece)
+        else:
+            body.write(piece)
+        used_bytes += size
+        used_chars += len(piece)
+        count += 1
+        if next_cursor is not None:
+            break
+
+    if not count:
+        if start or offset:
+            return [TextContent(type="text", text="No more results.")]
+        return [TextContent(type="text", text=empty_message)]
+
+    if per_record:
+        results = [TextContent(type="text", text=part) for part in parts]
+        if header:
+            results.insert(0, TextContent(type="text", text=header(count)))
+    else:
+        results = [TextContent(type="text", text=(header(count) if header else "") + body.getvalue())]
+
+    if next_cursor is not None:
+        results.append(TextContent(type="text", text=_truncation_note(next_cursor if paged else None)))
+    return results
@@ -1,6 +1,8 @@
 import re
 from googleapiclient.discovery import build
 from googleapiclient.errors import HttpError
+from googleapiclient.http import HttpRequest
+from youtube_transcript_api import YouTubeTranscriptApi
 from dotenv import load_dotenv
 import os
 
@@ -23,13 +25,38 @@ def validate_youtube_params(order: str, duration: str, published_after: str | No
         raise ValueError(f"Invalid published_after format: {published_after}. Must be RFC 3339 (e.g., 2023-01-01T00:00:00Z)")
 
 def get_youtube_client():
-    """Get a singleton YouTube API client instance."""
+    """Get a singleton YouTube API client instance.
+
+    When YOUTUBE_TRAFFIC_MODE is 'record', every request and response is appended to the
+    traffic log; when it is 'replay', responses are served from that log and no API key
+    or network access is needed.
+    """
+    from utils.traffic import get_traffic_mode, RecordingHttpRequest, ReplayHttpRequest  # Avoid circular import
+
+    # Cache the client instance (module-level singleton)
+    if hasattr(get_youtube_client, 'client'):
+        return get_youtube_client.client
+
+    mode = get_traffic_mode()
+    if mode == "replay":
+        get_youtube_client.client = build('youtube', 'v3', developerKey='replay', requestBuilder=ReplayHttpRequest)
+        return get_youtube_client.client
+
     api_key = os.getenv('YOUTUBE_API_KEY')
     if not api_key:
         raise YouTubeAPIError("YouTube API key is not set in environment variables")
-    
-    # Cache the client instance (module-level singleton)
-    if not hasattr(get_youtube_client, 'client'):
-        get_youtube_client.client = build('youtube', 'v3', developerKey=api_key)
-    
-    return get_youtube_client.client
\ No newline at end of file
+
+    request_builder = RecordingHttpRequest if mode == "record" else HttpRequest
+    get_youtube_client.client = build('youtube', 'v3', developerKey=api_key, requestBuilder=request_builder)
+    return get_youtube_client.client
+
+def get_transcript_api():
+    """Get a YouTubeTranscriptApi instance, recording or replaying per YOUTUBE_TRAFFIC_MODE."""
+    from utils.traffic import get_traffic_mode, RecordingTranscriptApi, ReplayTranscriptApi  # Avoid circular import
+
+    mode = get_traffic_mode()
+    if mode == "replay":
+        return ReplayTranscriptApi()
+    if mode == "record":
+        return RecordingTranscriptApi()
+    return YouTubeTranscriptApi()
@@ -0,0 +1,255 @@
+import atexit
+import gzip
+import json
+import os
+import threading
+import time
+import zlib
+from collections import defaultdict
+from typing import Iterator
+from urllib.parse import urlparse, parse_qsl
+import httplib2
+from googleapiclient.errors import HttpError
+from googleapiclient.http import HttpRequest
+from youtube_transcript_api import (
+    YouTubeTranscriptApi, FetchedTranscript, FetchedTranscriptSnippet,
+    NoTranscriptFound, TranscriptsDisabled, TranscriptList,
+)
+from utils.tool_utils import YouTubeAPIError
+
+# YOUTUBE_TRAFFIC_MODE selects 'record' or 'replay'; anything else talks to YouTube directly.
+# Logs are JSON Lines, gzip-compressed when the path ends in '.gz'.
+DEFAULT_LOG_PATH = "youtube_traffic.jsonl.gz"
+
+def get_traffic_mode() -> str | None:
+    """Return 'record' or 'replay' when traffic capture is enabled, otherwise None."""
+    mode = os.getenv('YOUTUBE_TRAFFIC_MODE', '').lower()
+    if mode and mode not in {"record", "replay"}:
+        raise YouTubeAPIError(f"Invalid YOUTUBE_TRAFFIC_MODE: {mode}. Must be one of {{'record', 'replay'}}")
+    return mode or None
+
+def _log_path() -> str:
+    return os.getenv('YOUTUBE_TRAFFIC_LOG', DEFAULT_LOG_PATH)
+
+GZIP_MAGIC = b"\x1f\x8b\x08"
+INFLATE_CHUNK = 64 * 1024
+
+def _inflate_member(data: bytes, pos: int) -> tuple[bytes, int, bool]:
+    """Inflate the gzip member starting at pos.
+
+    Returns the decompressed bytes, the offset where decoding stopped and whether the
+    member was complete. A member cut off by a killed recorder decodes up to the point
+    where the next member's header (or the end of the file) begins.
+    """
+    decompressor = zlib.decompressobj(wbits=31)
+    out = []
+    offset = pos
+    while offset < len(data):
+        chunk = data[offset:offset + INFLATE_CHUNK]
+        checkpoint = decompressor.copy()
+        try:
+            out.append(decompressor.decompress(chunk))
+        except zlib.error:
+            # Replay the failing chunk byte by byte to keep everything before the bad byte.
+            # After a sync flush the next member's header is an invalid deflate block, so
+            # decoding a truncated member stops exactly where the next member starts.
+            decompressor = checkpoint
+            for i in range(len(chunk)):
+                try:
+                    out.append(decompressor.decompress(chunk[i:i + 1]))
+                except zlib.error:
+                    return b"".join(out), offset + i, False
+        if decompressor.eof:
+            return b"".join(out), offset + len(chunk) - len(decompressor.unused_data), True
+        offset += len(chunk)
+    return b"".join(out), len(data), False
+
+def _read_log_lines(path: str) -> Iterator[str]:
+    """Yield the complete JSON lines of a traffic log.
+
+    Each recording session appends its own gzip member; sessions that were killed leave
+    an unterminated member behind. Members are decoded one by one, resynchronising on
+    the next gzip header after a truncated member, and a partial trailing line is dropped.
+    """
+    with open(path, "rb") as f:
+        data = f.read()
+    if not path.endswith(".gz"):
+        text = data.decode("utf-8", errors="replace")
+        yield from text[:text.rfind("\n") + 1].splitlines()
+        return
+
+    pos = 0
+    while pos < len(data):
+        if not data.startswith(GZIP_MAGIC, pos):
+            raise YouTubeAPIError(f"Traffic log {path} is corrupt at byte {pos}")
+        out, end, complete = _inflate_member(data, pos)
+        text = out.decode("utf-8", errors="replace")
+        if not complete:
+            text = text[:text.rfind("\n") + 1]
+            next_member = data.find(GZIP_MAGIC, max(pos + 1, end - 16))
+            end = next_member if next_member != -1 else len(data)
+        yield from text.splitlines()
+        pos = end
+
+def _api_key(method_id: str, uri: str) -> str:
+    # The API key and transport-level parameters do not identify a request
+    params = sorted((k, v) for k, v in parse_qsl(urlparse(uri).query) if k not in {"key", "alt", "prettyPrint"})
+    return method_id + "?" + "&".join(f"{k}={v}" for k, v in params)
+
+def _transcript_key(video_id: str, languages) -> str:
+    return f"transcript:{video_id}?languages={','.join(languages)}"
+
+class TrafficRecorder:
+    """Appends request/response entries with their latency to the traffic log.
+
+    The log stays open as a single stream for the life of the process so gzip keeps
+    compressing across entries, and each session appends its own gzip member. Each entry
+    is flushed (Z_SYNC_FLUSH for gzip) so it is readable even if the process dies before
+    the stream is closed at exit; the replayer skips past such unterminated members.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.lock = threading.Lock()
+        self.compressed = path.endswith(".gz")
+        self.file = gzip.open(path, "ab") if self.compressed else open(path, "ab")
+        atexit.register(self.close)
+
+    def write(self, entry: dict) -> None:
+        line = (json.dumps(entry, separators=(",", ":")) + "\n").encode("utf-8")
+        with self.lock:
+            self.file.write(line)
+            if self.compressed:
+                self.file.flush(zlib.Z_SYNC_FLUSH)
+            else:
+                self.file.flush()
+
+    def close(self) -> None:
+        with self.lock:
+            self.file.close()
+
+class TrafficReplayer:
+    """Serves logged responses by request key, cycling through repeats in recorded order."""
+
+    def __init__(self, path: str, latency_scale: float):
+        if not os.path.exists(path):
+            raise YouTubeAPIError(f"Traffic log not found for replay: {path}")
+        self.latency_scale = latency_scale
+        self.lock = threading.Lock()
+        self.entries = defaultdict(list)
+        self.positions = defaultdict(int)
+        try:
+            for line in _read_log_lines(path):
+                if line.strip():
+                    entry = json.loads(line)
+                    self.entries[entry['key']].append(entry)
+        except (ValueError, KeyError) as e:
+            raise YouTubeAPIError(f"Traffic log {path} could not be decoded: {e}")
+
+    def next(self, key: str) -> dict:
+        with self.lock:
+            entries = self.entries.get(key)
+            if not entries:
+                raise YouTubeAPIError(f"No recorded traffic for request: {key}")
+            entry = entries[self.positions[key] % len(entries)]
+            self.positions[key] += 1
+        if self.latency_scale > 0:
+            time.sleep(entry['elapsed'] * self.latency_scale)
+        return entry
+
+_recorder = None
+_replayer = None
+
+def get_recorder() -> TrafficRecorder:
+    global _recorder
+    if _recorder is None:
+        _recorder = TrafficRecorder(_log_path())
+    return _recorder
+
+def get_replayer() -> TrafficReplayer:
+    global _replayer
+    if _replayer is None:
+        scale = float(os.getenv('YOUTUBE_REPLAY_LATENCY_SCALE', '1.0'))
+        _replayer = TrafficReplayer(_log_path(), scale)
+    return _replayer
+
+class RecordingHttpRequest(HttpRequest):
+    """HttpRequest that logs every YouTube Data API response, or error, with its latency."""
+
+    def execute(self, http=None, num_retries=0):
+        started = time.perf_counter()
+        entry = {'kind': 'api', 'key': _api_key(self.methodId, self.uri)}
+        try:
+            response = super().execute(http=http, num_retries=num_retries)
+            entry.update(status=200, body=response)
+            return response
+        except HttpError as e:
+            entry.update(status=e.resp.status, reason=e.resp.reason,
+                         body=e.content.decode("utf-8", errors="replace"))
+            raise
+        except Exception as e:
+            entry.update(status="error", body=str(e))
+            raise
+        finally:
+            entry['elapsed'] = round(time.perf_counter() - started, 4)
+            get_recorder().write(entry)
+
+class ReplayHttpRequest(HttpRequest):
+    """HttpRequest that answers from the traffic log instead of the network."""
+
+    def execute(self, http=None, num_retries=0):
+        entry = get_replayer().next(_api_key(self.methodId, self.uri))
+        if entry['status'] == "error":
+            raise YouTubeAPIError(entry['body'])
+        if entry['status'] != 200:
+            resp = httplib2.Response({'status': entry['status']})
+            resp.reason = entry.get('reason', "")
+            raise HttpError(resp, entry['body'].encode("utf-8"), uri=self.uri)
+        return entry['body']
+
+class RecordingTranscriptApi(YouTubeTranscriptApi):
+    """YouTubeTranscriptApi that logs fetched transcripts, or why none was available."""
+
+    def fetch(self, video_id: str, languages=("en",), preserve_formatting: bool = False) -> FetchedTranscript:
+        started = time.perf_counter()
+        entry = {'kind': 'transcript', 'key': _transcript_key(video_id, languages)}
+        try:
+            transcript = super().fetch(video_id, languages=languages, preserve_formatting=preserve_formatting)
+            entry.update(status="ok", body={
+                'language': transcript.language,
+                'language_code': transcript.language_code,
+                'is_generated': transcript.is_generated,
+                'snippets': [[s.text, s.start, s.duration] for s in transcript.snippets],
+            })
+            return transcript
+        except (NoTranscriptFound, TranscriptsDisabled) as e:
+            entry.update(status=type(e).__name__, body=None)
+            raise
+        except Exception as e:
+            entry.update(status="error", body=str(e))
+            raise
+        finally:
+            entry['elapsed'] = round(time.perf_counter() - started, 4)
+            get_recorder().write(entry)
+
+class ReplayTranscriptApi:
+    """Stand-in for YouTubeTranscriptApi that answers fetch() from the traffic log."""
+
+    def fetch(self, video_id: str, languages=("en",), preserve_formatting: bool = False) -> FetchedTranscript:
+        entry = get_replayer().next(_transcript_key(video_id, languages))
+        if entry['status'] == "NoTranscriptFound":
+            raise NoTranscriptFound(video_id, list(languages), TranscriptList(video_id, {}, {}, []))
+        if entry['status'] == "TranscriptsDisabled":
+            raise TranscriptsDisabled(video_id)
+        if entry['status'] != "ok":
+            raise YouTubeAPIError(entry['body'])
+
+        body = entry['body']
+        return FetchedTranscript(
+            snippets=[FetchedTranscriptSnippet(text=text, start=start, duration=duration)
+                      for text, start, duration in body['snippets']],
+            video_id=video_id,
+            language=body['language'],
+            language_code=body['language_code'],
+            is_generated=body['is_generated'],
+        )
@@ -0,0 +1,137 @@
+import re
+import heapq
+from collections import Counter
+from dataclasses import dataclass
+from typing import Iterable, Iterator, List
+
+# Bracketed annotations like [Music] are never speech
+ANNOTATION_PATTERN = re.compile(r"\[[^\]]*\]")
+# Speaker markers, parentheses and filler words are only noise in auto-generated captions
+NOISE_PATTERN = re.compile(r"\([^)]*\)|>>")
+FILLER_WORDS = {"um", "uh", "uhm", "erm", "hmm", "mm", "ah"}
+SENTENCE_END = re.compile(r"[.!?][\"')\]]*$")
+
+# Rolling captions only ever repeat the tail of the previous line, so the
+# overlap search is bounded to keep the whole pipeline linear in the snippets.
+# Shorter overlaps are too likely to be genuine repetition to drop.
+MIN_OVERLAP_WORDS = 3
+MAX_OVERLAP_WORDS = 20
+# Auto-generated captions carry no punctuation; fall back to pauses and length
+PAUSE_SECONDS = 1.5
+MAX_SEGMENT_WORDS = 60
+
+STOP_WORDS = {
+    "a", "an", "and", "are", "as", "at", "be", "but", "by", "for", "from", "have",
+    "i", "if", "in", "is", "it", "its", "of", "on", "or", "so", "that", "the",
+    "this", "to", "was", "we", "were", "what", "with", "you", "your", "they",
+    "he", "she", "not", "do", "just", "like", "there", "can", "will", "all",
+}
+
+@dataclass
+class TranscriptSegment:
+    """A sentence-level run of transcript text starting at a given offset."""
+    start: float
+    text: str
+
+def format_timestamp(seconds: float) -> str:
+    """Format a transcript offset in seconds as [h:]mm:ss."""
+    minutes, secs = divmod(int(seconds), 60)
+    hours, minutes = divmod(minutes, 60)
+    if hours:
+        return f"{hours}:{minutes:02d}:{secs:02d}"
+    return f"{minutes:02d}:{secs:02d}"
+
+def clean_words(text: str, generated: bool = True) -> List[str]:
+    """Strip caption annotations, plus speaker markers and filler words for auto-generated captions."""
+    text = ANNOTATION_PATTERN.sub(" ", text.replace("\n", " "))
+    if not generated:
+        return text.split()
+    text = NOISE_PATTERN.sub(" ", text)
+    return [w for w in text.split() if w.lower().strip(",.") not in FILLER_WORDS]
+
+def _normalize(word: str) -> str:
+    return word.lower().strip(".,!?;:\"'")
+
+def dedupe_snippets(snippets: Iterable, generated: bool = True) -> Iterator[tuple]:
+    """Yield (start, end, words) per snippet with rolling-caption repeats removed.
+
+    Auto-generated captions re-emit the tail of the previous line at the head of the
+    next one. Any prefix of a snippet that matches the suffix of what was already
+    emitted (MIN_OVERLAP_WORDS to MAX_OVERLAP_WORDS words) is dropped, as are snippets
+    that add nothing. Manually written captions are passed through unchanged.
+    """
+    tail: List[str] = []
+    for snippet in snippets:
+        words = clean_words(snippet.text, generated)
+        if not words:
+            continue
+        if not generated:
+            yield snippet.start, snippet.start + snippet.duration, words
+            continue
+        normalized = [_normalize(w) for w in words]
+
+        overlap = 0
+        for size in range(min(len(tail), len(normalized), MAX_OVERLAP_WORDS), MIN_OVERLAP_WORDS - 1, -1):
+            if tail[-size:] == normalized[:size]:
+                overlap = size
+                break
+
+        new_words = words[overlap:]
+        if not new_words:
+            continue
+
+        tail = (tail + normalized[overlap:])[-MAX_OVERLAP_WORDS:]
+        yield snippet.start, snippet.start + snippet.duration, new_words
+
+def segment_snippets(snippets: Iterable, generated: bool = True) -> Iterator[TranscriptSegment]:
+    """Merge deduplicated snippets into sentence-level segments.
+
+    A segment is closed on sentence-ending punctuation, on a pause longer than
+    PAUSE_SECONDS between snippets, or once it reaches MAX_SEGMENT_WORDS words.
+    """
+    words: List[str] = []
+    start = 0.0
+    last_end = None
+
+    for snippet_start, snippet_end, new_words in dedupe_snippets(snippets, generated):
+        if words and last_end is not None and snippet_start - last_end > PAUSE_SECONDS:
+            yield TranscriptSegment(start=start, text=" ".join(words))
+            words = []
+
+        for word in new_words:
+            if not words:
+                start = snippet_start
+            words.append(word)
+            if SENTENCE_END.search(word) or len(words) >= MAX_SEGMENT_WORDS:
+                yield TranscriptSegment(start=start, text=" ".join(words))
+                words = []
+
+        last_end = snippet_end
+
+    if words:
+        yield TranscriptSegment(start=start, text=" ".join(words))
+
+def summarize_segments(segments: List[TranscriptSegment], max_segments: int) -> List[TranscriptSegment]:
+    """Pick the most informative segments, returned in their original order.
+
+    Segments are scored by the average corpus frequency of their content words,
+    a simple extractive summary that needs one pass to count and one to score.
+    """
+    if len(segments) <= max_segments:
+        return segments
+
+    tokenized = [[w for w in (_normalize(word) for word in s.text.split()) if w and w not in STOP_WORDS]
+                 for s in segments]
+    frequencies = Counter(w for words in tokenized for w in words)
+    if not frequencies:
+        return segments[:max_segments]
+
+    top = max(frequencies.values())
+    scores = [sum(frequencies[w] for w in words) / (top * len(words)) if words else 0.0
+              for words in tokenized]
+    chosen = heapq.nlargest(max_segments, range(len(segments)), key=scores.__getitem__)
+    return [segments[i] for i in sorted(chosen)]
+
+def format_segment(segment: TranscriptSegment) -> str:
+    """Format a segment as a timestamped transcript line."""
+    return f"[{format_timestamp(segment.start)}] {segment.text}"